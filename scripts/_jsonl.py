@@ -0,0 +1,102 @@
+"""JSONL helpers shared by the bench_*.py scripts."""
+
+import json, re
+
+# Prefer orjson (much faster parse/serialize); fall back to the stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson reads integers wider than 64 bits as floats; lines that may hold
+# one (a run of 19+ digits) are parsed by the stdlib so values survive.
+_WIDE_INT = re.compile(rb'\d{19}')
+
+# orjson parses nesting of any depth but only serializes 255 levels; lines
+# with that many brackets are parsed by the stdlib so they stay writable.
+_ORJSON_MAX_DEPTH = 255
+
+def _std_loads(line):
+    try:
+        return json.loads(line)
+    except RecursionError:
+        raise ValueError('JSON nested too deeply') from None
+
+def _std_dumps(obj):
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def _std_pretty(obj):
+    try:
+        return json.dumps(obj, indent=2)
+    except RecursionError:
+        # The indenting encoder is pure Python and needs more stack per level
+        # than the parser did; the compact C encoder handles what was parsed.
+        return json.dumps(obj)
+
+# loads() raises ValueError for any line it cannot parse: JSONDecodeError
+# from either parser, UnicodeDecodeError, and nesting too deep for the stdlib.
+if orjson is not None:
+    def loads(line):
+        if (not _WIDE_INT.search(line)
+                and line.count(b'[') + line.count(b'{') < _ORJSON_MAX_DEPTH):
+            try:
+                return orjson.loads(line)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN/Infinity, which the stdlib accepts
+        return _std_loads(line)
+
+    # orjson writes NaN/Infinity as null, so output containing null is
+    # re-encoded by the stdlib to keep them.
+    def dumps(obj):
+        try:
+            buf = orjson.dumps(obj)
+        except TypeError:  # integers wider than 64 bits
+            return _std_dumps(obj)
+        return _std_dumps(obj) if b'null' in buf else buf
+
+    def pretty(obj):
+        try:
+            buf = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:  # integers wider than 64 bits
+            return _std_pretty(obj)
+        return _std_pretty(obj) if b'null' in buf else buf.decode()
+else:
+    loads = _std_loads
+    dumps = _std_dumps
+    pretty = _std_pretty
+
+def read_lines(path, chunk_size=1 << 20):
+    """Yield stripped, non-empty lines of a file as bytes.
+
+    Reads fixed-size binary chunks and splits on newlines, keeping any
+    partial trailing line until a chunk containing a newline arrives.
+    """
+    with open(path, 'rb') as f:
+        pending = []
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            j = chunk.find(b'\n')
+            if j == -1:
+                pending.append(chunk)
+                continue
+            if pending:
+                # Only join the carried-over pieces once a line is complete
+                head = len(chunk)
+                pending.append(chunk)
+                chunk = b''.join(pending)
+                pending = []
+                j = len(chunk) - head + j
+            i = 0
+            while j != -1:
+                line = chunk[i:j].strip()
+                if line:
+                    yield line
+                i = j + 1
+                j = chunk.find(b'\n', i)
+            if i < len(chunk):
+                pending.append(chunk[i:])
+        line = b''.join(pending).strip()
+        if line:
+            yield line
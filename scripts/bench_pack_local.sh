@@ -16,6 +16,7 @@ cp -v scripts/bench_repair_smoke.sh "$tmp/scripts/" >/dev/null
 cp -v scripts/bench_matrix_local.sh "$tmp/scripts/" >/dev/null
 cp -v scripts/bench_env_info.sh "$tmp/scripts/" >/dev/null
 cp -v scripts/bench_to_html.py "$tmp/scripts/" >/dev/null
+cp -v scripts/_jsonl.py "$tmp/scripts/" >/dev/null
 cp -v docs/benchmarks.md "$tmp/docs/" >/dev/null
 
 cat >"$tmp/README.txt" <<'TXT'
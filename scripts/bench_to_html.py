@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-import sys, json, os, html
+import sys, os, html, functools
+from collections import defaultdict
+
+from _jsonl import loads, pretty, read_lines
 
 TEMPLATE_HEAD = """
 <!doctype html>
@@ -44,6 +47,16 @@ def human_mib(x):
     except Exception:
         return ""
 
+# Text columns (scenario, gpu, interleave) take a handful of distinct values,
+# so memoizing the escape turns most calls into a cache hit.
+esc_text = functools.lru_cache(maxsize=1024)(html.escape)
+
+def num_cell(x, esc=esc_text):
+    # Numbers cannot contain markup; only escape values of other types.
+    if isinstance(x, (int, float)):
+        return str(x)
+    return esc(str(x))
+
 def main():
     if len(sys.argv) < 3:
         print("usage: bench_to_html.py <input.jsonl> <output.html>")
@@ -52,62 +65,75 @@ def main():
     outp = sys.argv[2]
     metas = []
     rows = []
-    with open(src) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            t = obj.get('type')
-            if t == 'meta':
-                metas.append(obj)
-            elif t == 'result' or t is None:
-                rows.append(obj)
+    # Bind hot-loop lookups to locals
+    add_meta = metas.append
+    add_row = rows.append
+    for line in read_lines(src):
+        # Records are JSON objects; skip anything else without raising.
+        if line[:1] != b'{':
+            continue
+        try:
+            obj = loads(line)
+        except ValueError:  # loads() reports every unparsable line this way
+            continue
+        t = obj.get('type')
+        if t == 'result' or t is None:
+            add_row(obj)
+        elif t == 'meta':
+            add_meta(obj)
     # Build env blocks
-    env_blocks = []
+    env_blocks = ['<pre class="mono">' + html.escape(pretty(m)) + '</pre>' for m in metas]
+    # Avoid str.format on TEMPLATE_HEAD because CSS braces conflict with formatting.
+    head = TEMPLATE_HEAD.replace('{src}', html.escape(src)).replace('{env_blocks}', '\n'.join(env_blocks))
+    parts = [head]
+    # Group rows by host (from corresponding meta by source) or by r['source']
+    # Build source->host map
+    source_to_host = {}
     for m in metas:
-        env_blocks.append('<pre class="mono">{}</pre>'.format(html.escape(json.dumps(m, indent=2))))
-    with open(outp, 'w') as w:
-        # Avoid str.format on TEMPLATE_HEAD because CSS braces conflict with formatting.
-        head = TEMPLATE_HEAD.replace('{src}', html.escape(src)).replace('{env_blocks}', '\n'.join(env_blocks))
-        w.write(head)
-        # Group rows by host (from corresponding meta by source) or by r['source']
-        # Build source->host map
-        source_to_host = {}
-        for m in metas:
-            srcname = m.get('source', '')
-            host = m.get('host', srcname)
-            source_to_host[srcname] = host
-        # Group
-        groups = {}
-        for r in rows:
-            srcname = r.get('source', '')
-            host = source_to_host.get(srcname, srcname)
-            groups.setdefault(host, []).append(r)
-        for host in sorted(groups.keys()):
-            w.write(TEMPLATE_HOST_HEAD.format(host=html.escape(str(host))))
-            for r in groups[host]:
-                ok = r.get('ok')
-                w.write('<tr>')
-                w.write('<td>{}</td>'.format(html.escape(str(r.get('scenario','')))))
-                w.write('<td>{}</td>'.format(html.escape(str(r.get('gpu','')) or str(r.get('gpu_mode','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('k','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('parity_pct','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('chunk','')))))
-                w.write('<td>{}</td>'.format(html.escape(str(r.get('interleave','')))))
-                w.write('<td class="mono">{}</td>'.format(human_mib(r.get('total_bytes',0))))
-                w.write('<td class="mono">{}</td>'.format(human_mib(r.get('parity_bytes',0))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('encode_ms','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('repair_ms','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('repaired_chunks','')))))
-                w.write('<td class="mono">{}</td>'.format(html.escape(str(r.get('failed_chunks','')))))
-                cls = 'ok' if ok else 'bad'
-                w.write('<td class="{}">{}</td>'.format(cls, html.escape(str(ok))))
-                w.write('</tr>\n')
-            w.write(TEMPLATE_TABLE_FOOT)
+        srcname = m.get('source', '')
+        host = m.get('host', srcname)
+        source_to_host[srcname] = host
+    # Group
+    groups = defaultdict(list)
+    host_of = source_to_host.get
+    group_of = groups.__getitem__
+    # Collated input keeps each source's rows together, so only look up
+    # the host bucket when the source changes. The sentinel never equals a
+    # row's source (which may be null), so the first row always looks up.
+    last_src = object()
+    bucket = None
+    for r in rows:
+        srcname = r.get('source', '')
+        if srcname != last_src:
+            bucket = group_of(host_of(srcname, srcname))
+            last_src = srcname
+        bucket.append(r)
+    esc = esc_text
+    for host in sorted(groups):
+        parts.append(TEMPLATE_HOST_HEAD.format(host=esc(str(host))))
+        for r in groups[host]:
+            get = r.get
+            ok = get('ok')
+            cls = 'ok' if ok else 'bad'
+            parts.append(
+                f'<tr><td>{esc(str(get("scenario","")))}</td>'
+                f'<td>{esc(str(get("gpu","")) or str(get("gpu_mode","")))}</td>'
+                f'<td class="mono">{num_cell(get("k",""))}</td>'
+                f'<td class="mono">{num_cell(get("parity_pct",""))}</td>'
+                f'<td class="mono">{num_cell(get("chunk",""))}</td>'
+                f'<td>{esc(str(get("interleave","")))}</td>'
+                f'<td class="mono">{human_mib(get("total_bytes",0))}</td>'
+                f'<td class="mono">{human_mib(get("parity_bytes",0))}</td>'
+                f'<td class="mono">{num_cell(get("encode_ms",""))}</td>'
+                f'<td class="mono">{num_cell(get("repair_ms",""))}</td>'
+                f'<td class="mono">{num_cell(get("repaired_chunks",""))}</td>'
+                f'<td class="mono">{num_cell(get("failed_chunks",""))}</td>'
+                f'<td class="{cls}">{num_cell(ok)}</td></tr>\n'
+            )
+        parts.append(TEMPLATE_TABLE_FOOT)
+    # Encode the whole page once and hand it to the file in a single write.
+    with open(outp, 'wb', buffering=1 << 20) as w:
+        w.write(''.join(parts).encode('utf-8'))
     print(f"Wrote {outp}")
 
 if __name__ == '__main__':
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Regression tests for the bench JSONL scripts.
+
+Run with: python3 -m unittest discover -s scripts -p 'test_*.py'
+"""
+import os, subprocess, sys, tempfile, unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import _jsonl
+
+def nested(depth):
+    return '[' * depth + ']' * depth
+
+class DeepNestingTest(unittest.TestCase):
+    # Valid JSON that the stdlib cannot parse; the baseline scripts skipped it.
+    DEPTH = 2000
+
+    def test_loads_rejects_with_value_error(self):
+        line = ('{"a":%s}' % nested(self.DEPTH)).encode()
+        with self.assertRaises(ValueError):
+            _jsonl.loads(line)
+
+    def test_moderate_nesting_round_trips(self):
+        line = ('{"a":%s}' % nested(300)).encode()
+        obj = _jsonl.loads(line)
+        self.assertEqual(_jsonl.loads(_jsonl.dumps(obj)), obj)
+        self.assertEqual(_jsonl.loads(_jsonl.pretty(obj).encode()), obj)
+
+    def test_scripts_skip_deep_records(self):
+        deep = nested(self.DEPTH)
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'bench.jsonl')
+            with open(src, 'w') as f:
+                f.write('{"a":%s}\n' % deep)
+                f.write('{"type":"meta","host":"h","a":%s}\n' % deep)
+                f.write('{"type":"result","scenario":"kept","ok":true}\n')
+            collated = os.path.join(tmp, 'all.jsonl')
+            report = os.path.join(tmp, 'summary.html')
+            subprocess.run([sys.executable, os.path.join(HERE, 'bench_collate.py'), collated, src],
+                           check=True, stdout=subprocess.DEVNULL)
+            subprocess.run([sys.executable, os.path.join(HERE, 'bench_to_html.py'), src, report],
+                           check=True, stdout=subprocess.DEVNULL)
+            with open(collated, 'rb') as f:
+                records = [_jsonl.loads(line) for line in f]
+            self.assertEqual([r.get('scenario') for r in records if r.get('type') == 'result'], ['kept'])
+            self.assertEqual([r['host'] for r in records if r.get('type') == 'meta'], ['unknown'])
+            with open(report) as f:
+                self.assertIn('kept', f.read())
+
+if __name__ == '__main__':
+    unittest.main()